@@ -6,31 +6,45 @@ Features:
 - No large model files needed
 """
 
+import html
 import gradio as gr
-import numpy as np
+import pandas as pd
 import json
-from pymatgen.core import Composition, Element
+import string
+from mock_features import extract_features, noise
 
-# Load Pareto-optimal hypotheses
+# Load Pareto-optimal hypotheses as a DataFrame, parsed once for formatting the top candidates
 with open('asa_hypotheses_v2_optimized.json', 'r') as f:
-    hypotheses = json.load(f)
+    _HYPS_DF = pd.DataFrame(json.load(f))
 
 print("Demo loaded successfully!")
 
-def extract_features(composition, space_group=216, a=9.9, b=9.9, c=9.9, alpha=90, beta=90, gamma=90):
-    """Extract features from composition and structure for mock prediction."""
-    try:
-        comp = Composition(composition)
-        elements = [Element(el) for el in comp.elements]
-        fractions = [comp.get_atomic_fraction(el) for el in comp.elements]
-        
-        # Simple feature extraction for mock predictions
-        avg_atomic_number = np.average([el.Z for el in elements], weights=fractions)
-        avg_atomic_mass = np.average([el.atomic_mass for el in elements], weights=fractions)
-        
-        return avg_atomic_number, avg_atomic_mass, len(elements)
-    except Exception as e:
-        return None, None, None
+# Prediction results are emitted as HTML from a template built once at import,
+# so each request only substitutes values (no per-request markdown rendering)
+_RESULT_TEMPLATE = string.Template("""<h2>🔮 Predicted Properties for <strong>$composition</strong></h2>
+
+<h3>⚡ Ionic Conductivity</h3>
+<p><strong>$conductivity mS/cm</strong> - $conductivity_rating</p>
+
+<h3>🏗️ Thermodynamic Stability</h3>
+<p><strong>$stability eV/atom</strong> - $stability_rating</p>
+
+<h3>🌈 Band Gap</h3>
+<p><strong>$band_gap eV</strong> - $band_gap_rating</p>
+
+<hr>
+
+<h3>📊 Structure Parameters</h3>
+<ul>
+<li><strong>Space Group:</strong> $space_group</li>
+<li><strong>Lattice:</strong> a=${a}Å, b=${b}Å, c=${c}Å</li>
+<li><strong>Angles:</strong> α=${alpha}°, β=${beta}°, γ=${gamma}°</li>
+</ul>
+
+<hr>
+
+<p><strong>Note:</strong> This is a demo version with mock predictions. For production use, integrate trained ML models.</p>
+""")
 
 def predict_properties(composition, space_group, a, b, c, alpha, beta, gamma):
     """Generate mock predictions based on composition features."""
@@ -42,55 +56,53 @@ def predict_properties(composition, space_group, a, b, c, alpha, beta, gamma):
         
         # Mock predictions based on simple heuristics
         # Conductivity: higher for lighter elements
-        conductivity = max(0.1, 10.0 - (avg_mass / 20.0)) + np.random.uniform(-0.5, 0.5)
+        conductivity = max(0.1, 10.0 - (avg_mass / 20.0)) + noise(0.5)
         
         # Stability: more stable with more elements
-        stability = -2.0 + (n_elements * 0.3) + np.random.uniform(-0.2, 0.2)
+        stability = -2.0 + (n_elements * 0.3) + noise(0.2)
         
         # Band gap: higher for heavier elements
-        band_gap = max(0.0, (avg_z / 30.0) * 3.0) + np.random.uniform(-0.3, 0.3)
+        band_gap = max(0.0, (avg_z / 30.0) * 3.0) + noise(0.3)
+        
+        return _RESULT_TEMPLATE.substitute(
+            composition=html.escape(composition),
+            conductivity=f"{conductivity:.2f}",
+            conductivity_rating="✅ Excellent" if conductivity > 5 else "⚠️ Moderate" if conductivity > 2 else "❌ Low",
+            stability=f"{stability:.3f}",
+            stability_rating="✅ Stable" if stability > -0.5 else "⚠️ Metastable" if stability > -1.5 else "❌ Unstable",
+            band_gap=f"{band_gap:.2f}",
+            band_gap_rating="✅ Insulator" if band_gap > 3 else "⚠️ Semiconductor" if band_gap > 0.5 else "❌ Conductor",
+            space_group=space_group,
+            a=f"{a:.2f}", b=f"{b:.2f}", c=f"{c:.2f}",
+            alpha=alpha, beta=beta, gamma=gamma,
+        )
         
-        result = f"""
-## 🔮 Predicted Properties for **{composition}**
-
-### ⚡ Ionic Conductivity
-**{conductivity:.2f} mS/cm** - {"✅ Excellent" if conductivity > 5 else "⚠️ Moderate" if conductivity > 2 else "❌ Low"}
-
-### 🏗️ Thermodynamic Stability  
-**{stability:.3f} eV/atom** - {"✅ Stable" if stability > -0.5 else "⚠️ Metastable" if stability > -1.5 else "❌ Unstable"}
-
-### 🌈 Band Gap
-**{band_gap:.2f} eV** - {"✅ Insulator" if band_gap > 3 else "⚠️ Semiconductor" if band_gap > 0.5 else "❌ Conductor"}
-
----
-
-### 📊 Structure Parameters
-- **Space Group:** {space_group}
-- **Lattice:** a={a:.2f}Å, b={b:.2f}Å, c={c:.2f}Å
-- **Angles:** α={alpha}°, β={beta}°, γ={gamma}°
+    except Exception as e:
+        return f"❌ Error: {html.escape(str(e))}"
 
----
+def _build_top_candidates():
+    """Render the top Pareto-optimal candidates as markdown."""
+    parts = [
+        "# 🏆 Top 10 Pareto-Optimal Candidates\n",
+        "These materials were discovered through multi-objective optimization:\n",
+    ]
+    parts.extend(
+        f"### {i}. **{hyp.formula}**\n"
+        f"- **Conductivity:** {hyp.conductivity:.2f} mS/cm\n"
+        f"- **Stability:** {hyp.stability:.3f} eV/atom\n"
+        f"- **Band Gap:** {hyp.band_gap:.2f} eV\n"
+        f"- **Material ID:** {hyp.material_id}\n"
+        for i, hyp in enumerate(_HYPS_DF.head(10).itertuples(index=False), 1)
+    )
+    
+    return "\n".join(parts)
 
-**Note:** This is a demo version with mock predictions. For production use, integrate trained ML models.
-"""
-        return result
-        
-    except Exception as e:
-        return f"❌ Error: {str(e)}"
+# Hypotheses are static, so the top-10 markdown is rendered once at startup
+_TOP10_MD = _build_top_candidates()
 
 def show_top_candidates():
     """Display top Pareto-optimal candidates."""
-    result = "# 🏆 Top 10 Pareto-Optimal Candidates\n\n"
-    result += "These materials were discovered through multi-objective optimization:\n\n"
-    
-    for i, hyp in enumerate(hypotheses[:10], 1):
-        result += f"### {i}. **{hyp['composition']}**\n"
-        result += f"- **Conductivity:** {hyp['conductivity']:.2f} mS/cm\n"
-        result += f"- **Stability:** {hyp['stability']:.3f} eV/atom\n"
-        result += f"- **Band Gap:** {hyp['band_gap']:.2f} eV\n"
-        result += f"- **Space Group:** {hyp['space_group']}\n\n"
-    
-    return result
+    return _TOP10_MD
 
 # Create Gradio interface
 with gr.Blocks(title="Aura Lab - AI Materials Discovery", theme=gr.themes.Soft()) as demo:
@@ -132,7 +144,7 @@ with gr.Blocks(title="Aura Lab - AI Materials Discovery", theme=gr.themes.Soft()
                 predict_btn = gr.Button("🚀 Predict Properties", variant="primary", size="lg")
             
             with gr.Column():
-                output = gr.Markdown(label="Prediction Results")
+                output = gr.HTML(label="Prediction Results")
         
         predict_btn.click(
             fn=predict_properties,
@@ -7,138 +7,185 @@ Features:
 - Industry-ready materials discovery
 """
 
+import functools
+import heapq
+import html
 import gradio as gr
-import numpy as np
+import pandas as pd
 import json
-from pymatgen.core import Composition, Element
+import string
+from mock_features import extract_features, noise
 from scalability_calculator import ScalabilityCalculator
 
-# Load Pareto-optimal hypotheses
+# Load Pareto-optimal hypotheses as a DataFrame, parsed once for formatting and ranking
 with open('asa_hypotheses_v2_optimized.json', 'r') as f:
-    hypotheses = json.load(f)
+    _HYPS_DF = pd.DataFrame(json.load(f))
 
-# Initialize scalability calculator
-scalability_calc = ScalabilityCalculator()
+# Scalability calculator, created on first use so importing the app does not read its databases
+_scalability_calc = None
+
+def _get_calc():
+    """Return the shared ScalabilityCalculator, creating it on first use."""
+    global _scalability_calc
+    if _scalability_calc is None:
+        _scalability_calc = ScalabilityCalculator()
+    return _scalability_calc
 
 print("✅ Aura Lab v5 with Scalability Score loaded successfully!")
 
-def extract_features(composition, space_group=216, a=9.9, b=9.9, c=9.9, alpha=90, beta=90, gamma=90):
-    """Extract features from composition and structure for mock prediction."""
-    try:
-        comp = Composition(composition)
-        elements = [Element(el) for el in comp.elements]
-        fractions = [comp.get_atomic_fraction(el) for el in comp.elements]
-        
-        # Simple feature extraction for mock predictions
-        avg_atomic_number = np.average([el.Z for el in elements], weights=fractions)
-        avg_atomic_mass = np.average([el.atomic_mass for el in elements], weights=fractions)
-        
-        return avg_atomic_number, avg_atomic_mass, len(elements)
-    except Exception as e:
-        return None, None, None
+# Prediction results are emitted as HTML from a template built once at import,
+# so each request only substitutes values (no per-request markdown rendering)
+_RESULT_TEMPLATE = string.Template("""<h2>🔮 Predicted Properties for <strong>$composition</strong></h2>
 
-def predict_properties(composition, space_group, a, b, c, alpha, beta, gamma):
-    """Generate mock predictions with Scalability Score."""
-    try:
-        avg_z, avg_mass, n_elements = extract_features(composition, space_group, a, b, c, alpha, beta, gamma)
-        
-        if avg_z is None:
-            return "❌ Invalid composition formula. Please use standard chemical notation (e.g., LiCoO2, NaLiTm2F8)."
-        
-        # Mock predictions based on simple heuristics
-        conductivity = max(0.1, 10.0 - (avg_mass / 20.0)) + np.random.uniform(-0.5, 0.5)
-        stability = -2.0 + (n_elements * 0.3) + np.random.uniform(-0.2, 0.2)
-        band_gap = max(0.0, (avg_z / 30.0) * 3.0) + np.random.uniform(-0.3, 0.3)
-        
-        # Calculate Scalability Score
-        scalability_result = scalability_calc.calculate_scalability_score(composition)
-        scalability_score = scalability_result['scalability_score']
-        classification = scalability_result['classification']
-        
-        # Get metric details
-        eai = scalability_result['metrics']['element_abundance_index']['score']
-        sci = scalability_result['metrics']['synthesis_complexity_index']['score']
-        mis = scalability_result['metrics']['manufacturing_integration_score']['score']
-        
-        result = f"""
-## 🔮 Predicted Properties for **{composition}**
+<h3>⚡ Ionic Conductivity</h3>
+<p><strong>$conductivity mS/cm</strong> - $conductivity_rating</p>
 
-### ⚡ Ionic Conductivity
-**{conductivity:.2f} mS/cm** - {"✅ Excellent" if conductivity > 5 else "⚠️ Moderate" if conductivity > 2 else "❌ Low"}
+<h3>🏗️ Thermodynamic Stability</h3>
+<p><strong>$stability eV/atom</strong> - $stability_rating</p>
 
-### 🏗️ Thermodynamic Stability  
-**{stability:.3f} eV/atom** - {"✅ Stable" if stability > -0.5 else "⚠️ Metastable" if stability > -1.5 else "❌ Unstable"}
+<h3>🌈 Band Gap</h3>
+<p><strong>$band_gap eV</strong> - $band_gap_rating</p>
 
-### 🌈 Band Gap
-**{band_gap:.2f} eV** - {"✅ Insulator" if band_gap > 3 else "⚠️ Semiconductor" if band_gap > 0.5 else "❌ Conductor"}
+<hr>
 
----
+<h2>🏭 Manufacturing Scalability Score</h2>
 
-## 🏭 Manufacturing Scalability Score
+<h3>Overall Score: <strong>$scalability_score/10</strong> - $classification</h3>
 
-### Overall Score: **{scalability_score}/10** - {classification}
+<p>This score evaluates how easily this material can scale from lab to commercial production, based on:</p>
 
-This score evaluates how easily this material can scale from lab to commercial production, based on:
+<h4>📦 Element Abundance Index: <strong>$eai/10</strong></h4>
+<ul>
+<li>Measures availability and supply chain maturity of constituent elements</li>
+<li>Higher scores indicate abundant, accessible materials</li>
+</ul>
 
-#### 📦 Element Abundance Index: **{eai}/10**
-- Measures availability and supply chain maturity of constituent elements
-- Higher scores indicate abundant, accessible materials
+<h4>⚙️ Synthesis Complexity Index: <strong>$sci/10</strong></h4>
+<ul>
+<li>Evaluates manufacturing difficulty (temperature, steps, equipment)</li>
+<li>Higher scores indicate simpler, lower-cost processes</li>
+</ul>
 
-#### ⚙️ Synthesis Complexity Index: **{sci}/10**
-- Evaluates manufacturing difficulty (temperature, steps, equipment)
-- Higher scores indicate simpler, lower-cost processes
+<h4>🔧 Manufacturing Integration Score: <strong>$mis/10</strong></h4>
+<ul>
+<li>Assesses compatibility with existing battery manufacturing</li>
+<li>Higher scores indicate easier integration into production lines</li>
+</ul>
 
-#### 🔧 Manufacturing Integration Score: **{mis}/10**
-- Assesses compatibility with existing battery manufacturing
-- Higher scores indicate easier integration into production lines
+<hr>
 
----
+<h3>📊 Structure Parameters</h3>
+<ul>
+<li><strong>Space Group:</strong> $space_group</li>
+<li><strong>Lattice:</strong> a=${a}Å, b=${b}Å, c=${c}Å</li>
+<li><strong>Angles:</strong> α=${alpha}°, β=${beta}°, γ=${gamma}°</li>
+</ul>
 
-### 📊 Structure Parameters
-- **Space Group:** {space_group}
-- **Lattice:** a={a:.2f}Å, b={b:.2f}Å, c={c:.2f}Å
-- **Angles:** α={alpha}°, β={beta}°, γ={gamma}°
+<hr>
 
----
+<p><strong>💡 Insight:</strong> The Scalability Score addresses the #1 bottleneck in materials commercialization: <strong>translating lab discoveries to industrial production</strong>.</p>
 
-**💡 Insight:** The Scalability Score addresses the #1 bottleneck in materials commercialization: **translating lab discoveries to industrial production**.
+<p><strong>Note:</strong> This is a demo version with mock property predictions. Scalability scores use real data from Materials Project and industry research.</p>
+""")
 
-**Note:** This is a demo version with mock property predictions. Scalability scores use real data from Materials Project and industry research.
-"""
-        return result
+def _render_prediction(composition, space_group, a, b, c, alpha, beta, gamma, scalability_score, eai, sci, mis):
+    """Mock property predictions plus precomputed scalability metrics for one formula, as HTML."""
+    try:
+        avg_z, avg_mass, n_elements = extract_features(composition, space_group, a, b, c, alpha, beta, gamma)
+        
+        if avg_z is None:
+            return "❌ Invalid composition formula. Please use standard chemical notation (e.g., LiCoO2, NaLiTm2F8)."
+        
+        # Mock predictions based on simple heuristics
+        conductivity = max(0.1, 10.0 - (avg_mass / 20.0)) + noise(0.5)
+        stability = -2.0 + (n_elements * 0.3) + noise(0.2)
+        band_gap = max(0.0, (avg_z / 30.0) * 3.0) + noise(0.3)
+        
+        classification, _ = ScalabilityCalculator.classify_score(scalability_score)
+        
+        return _RESULT_TEMPLATE.substitute(
+            composition=html.escape(composition),
+            conductivity=f"{conductivity:.2f}",
+            conductivity_rating="✅ Excellent" if conductivity > 5 else "⚠️ Moderate" if conductivity > 2 else "❌ Low",
+            stability=f"{stability:.3f}",
+            stability_rating="✅ Stable" if stability > -0.5 else "⚠️ Metastable" if stability > -1.5 else "❌ Unstable",
+            band_gap=f"{band_gap:.2f}",
+            band_gap_rating="✅ Insulator" if band_gap > 3 else "⚠️ Semiconductor" if band_gap > 0.5 else "❌ Conductor",
+            scalability_score=scalability_score,
+            classification=classification,
+            # Metrics arrive as floats; SCI is whole penalty points, shown as '5' not '5.0'
+            eai=eai, sci=f"{sci:g}", mis=mis,
+            space_group=space_group,
+            a=f"{a:.2f}", b=f"{b:.2f}", c=f"{c:.2f}",
+            alpha=alpha, beta=beta, gamma=gamma,
+        )
         
     except Exception as e:
-        return f"❌ Error: {str(e)}"
+        return f"❌ Error: {html.escape(str(e))}"
 
-def show_top_candidates():
-    """Display top Pareto-optimal candidates with scalability scores."""
-    result = "# 🏆 Top 10 Pareto-Optimal Candidates\n\n"
-    result += "These materials were discovered through multi-objective optimization and ranked by scalability:\n\n"
+# Concurrent predict requests are coalesced by Gradio's queue into batches of up to this size
+MAX_BATCH_SIZE = 32
+# Queue workers, so several predict batches can be handled at once (Gradio's default is 1)
+QUEUE_CONCURRENCY = 4
+
+def predict_properties_batch(compositions, space_groups, a_values, b_values, c_values, alphas, betas, gammas):
+    """Generate mock predictions with Scalability Scores for a batch of queued requests."""
+    try:
+        # Calculate Scalability Scores for the whole batch in one call
+        scores, metrics = _get_calc().calculate_scalability_batch(compositions, return_metrics=True)
+    except Exception as e:
+        return [[f"❌ Error: {html.escape(str(e))}"] * len(compositions)]
     
-    # Calculate scalability for all hypotheses
-    hyp_with_scalability = []
-    for hyp in hypotheses[:10]:
-        try:
-            scalability_result = scalability_calc.calculate_scalability_score(hyp['composition'])
-            hyp['scalability_score'] = scalability_result['scalability_score']
-            hyp['scalability_class'] = scalability_result['classification']
-            hyp_with_scalability.append(hyp)
-        except:
-            hyp['scalability_score'] = 0
-            hyp['scalability_class'] = "Unknown"
-            hyp_with_scalability.append(hyp)
+    results = [
+        _render_prediction(*request, score, eai, sci, mis)
+        for request, score, (eai, sci, mis) in zip(
+            zip(compositions, space_groups, a_values, b_values, c_values, alphas, betas, gammas),
+            scores.tolist(),
+            metrics.tolist(),
+        )
+    ]
+    return [results]
+
+def predict_properties(composition, space_group, a, b, c, alpha, beta, gamma):
+    """Generate mock predictions with Scalability Score."""
+    return predict_properties_batch([composition], [space_group], [a], [b], [c], [alpha], [beta], [gamma])[0][0]
+
+def _top_hypotheses(n=10):
+    """The n most scalable hypotheses with scalability columns, all scored in one pass."""
+    scores = _get_calc().calculate_scalability_batch(_HYPS_DF['formula'].tolist())
+    # Top-n selection rather than a full sort; like a stable sort, ties keep hypothesis order
+    top = heapq.nlargest(n, range(len(scores)), key=scores.__getitem__)
     
-    # Sort by scalability score
-    hyp_with_scalability.sort(key=lambda x: x['scalability_score'], reverse=True)
+    ranked = _HYPS_DF.iloc[top].copy()
+    ranked['scalability_score'] = scores[top]
+    ranked['scalability_class'] = [ScalabilityCalculator.classify_score(score)[0] for score in scores[top]]
+    
+    return ranked
+
+@functools.lru_cache(maxsize=None)
+def _build_top_candidates():
+    """Render the top Pareto-optimal candidates, ranked by scalability, as markdown."""
+    top = _top_hypotheses(10)
     
-    for i, hyp in enumerate(hyp_with_scalability, 1):
-        result += f"### {i}. **{hyp['composition']}** - Scalability: {hyp['scalability_score']}/10 ({hyp['scalability_class']})\n"
-        result += f"- **Conductivity:** {hyp['conductivity']:.2f} mS/cm\n"
-        result += f"- **Stability:** {hyp['stability']:.3f} eV/atom\n"
-        result += f"- **Band Gap:** {hyp['band_gap']:.2f} eV\n"
-        result += f"- **Space Group:** {hyp['space_group']}\n\n"
+    parts = [
+        "# 🏆 Top 10 Pareto-Optimal Candidates\n",
+        "These materials were discovered through multi-objective optimization and ranked by scalability:\n",
+    ]
+    parts.extend(
+        f"### {i}. **{hyp.formula}** - Scalability: {hyp.scalability_score}/10 ({hyp.scalability_class})\n"
+        f"- **Conductivity:** {hyp.conductivity:.2f} mS/cm\n"
+        f"- **Stability:** {hyp.stability:.3f} eV/atom\n"
+        f"- **Band Gap:** {hyp.band_gap:.2f} eV\n"
+        f"- **Material ID:** {hyp.material_id}\n"
+        for i, hyp in enumerate(top.itertuples(index=False), 1)
+    )
     
-    return result
+    return "\n".join(parts)
+
+def show_top_candidates():
+    """Display top Pareto-optimal candidates with scalability scores."""
+    # Hypotheses are static, so scores, ranking and markdown are computed on the first click only
+    return _build_top_candidates()
 
 # Create Gradio interface
 with gr.Blocks(title="Aura Lab - Scalable Materials Discovery") as demo:
@@ -186,19 +233,22 @@ with gr.Blocks(title="Aura Lab - Scalable Materials Discovery") as demo:
                 predict_btn = gr.Button("🚀 Predict Properties + Scalability", variant="primary", size="lg")
             
             with gr.Column():
-                output = gr.Markdown(label="Prediction Results")
+                output = gr.HTML(label="Prediction Results")
         
         predict_btn.click(
-            fn=predict_properties,
+            fn=predict_properties_batch,
             inputs=[composition_input, space_group_input, a_input, b_input, c_input, alpha_input, beta_input, gamma_input],
-            outputs=output
+            outputs=output,
+            batch=True,
+            max_batch_size=MAX_BATCH_SIZE
         )
     
     with gr.Tab("🏆 Top Discoveries"):
         gr.Markdown("## AI-Discovered Pareto-Optimal Materials (Ranked by Scalability)")
         top_candidates_output = gr.Markdown()
         show_btn = gr.Button("📊 Show Top 10 Candidates", variant="primary")
-        show_btn.click(fn=show_top_candidates, outputs=top_candidates_output)
+        # Served from a cache, so it bypasses the queue instead of waiting behind predict batches
+        show_btn.click(fn=show_top_candidates, outputs=top_candidates_output, queue=False)
     
     with gr.Tab("🏭 About Scalability Score"):
         gr.Markdown("""
@@ -317,5 +367,8 @@ with gr.Blocks(title="Aura Lab - Scalable Materials Discovery") as demo:
         **Research Foundation:** MIT/Berkeley Manufacturing Scalability Study (2021)
         """)
 
+# Batched events run through the queue
+demo.queue(concurrency_count=QUEUE_CONCURRENCY)
+
 if __name__ == "__main__":
     demo.launch(server_name="0.0.0.0", server_port=7860)
@@ -0,0 +1,94 @@
+"""
+Composition features and noise for the demo apps' mock predictions
+Shared by app_v4_final and app_v5_scalability
+"""
+
+import functools
+import itertools
+
+import numpy as np
+
+from scalability_calculator import parse_formula
+
+# pymatgen is imported on the first prediction so the UI is served without waiting on it
+Composition = None
+Element = None
+_SYMBOL_TO_Z = None
+_Z2MASS = None
+
+
+def _ensure_pymatgen():
+    """Import pymatgen and build the element lookup tables on first use."""
+    global Composition, Element, _SYMBOL_TO_Z, _Z2MASS
+    if Composition is not None:
+        return
+    print("⏳ Loading pymatgen (first prediction)...")
+    from pymatgen.core import Composition as _Composition, Element as _Element
+    # Atomic masses indexed by atomic number, so feature extraction does a
+    # single array gather instead of per-call Element attribute lookups
+    symbol_to_z = {}
+    z2mass = np.full(119, np.nan)
+    for z in range(1, 119):
+        element = _Element.from_Z(z)
+        symbol_to_z[element.symbol] = z
+        z2mass[z] = float(element.atomic_mass)
+    _SYMBOL_TO_Z = symbol_to_z
+    _Z2MASS = z2mass
+    Element = _Element
+    # Assigned last: a non-None Composition means everything above is ready
+    Composition = _Composition
+
+
+def _composition_arrays(formula):
+    """Parse a formula into (atomic numbers, atomic masses, atomic fractions) arrays."""
+    _ensure_pymatgen()
+    pairs = parse_formula(formula)
+    if pairs is not None:
+        zs = np.fromiter((_SYMBOL_TO_Z[symbol] for symbol, _ in pairs), dtype=np.int16, count=len(pairs))
+        masses = _Z2MASS[zs]
+    else:
+        # Parentheses, whitespace, isotopes etc. are left to pymatgen
+        comp = Composition(formula)
+        elements = comp.elements
+        if not all(isinstance(el, Element) for el in elements):
+            raise ValueError(f"{formula} contains non-element species")
+        pairs = tuple((el.symbol, comp[el]) for el in elements)
+        zs = np.fromiter((el.Z for el in elements), dtype=np.int16, count=len(elements))
+        # Masses come from the parsed elements, as isotopes such as D share
+        # their element's Z but not its standard atomic mass
+        masses = np.fromiter((float(el.atomic_mass) for el in elements), dtype=np.float64, count=len(elements))
+    amounts = np.fromiter((amount for _, amount in pairs), dtype=np.float64, count=len(pairs))
+    total = amounts.sum()
+    if not pairs or total == 0:
+        raise ValueError(f"{formula} contains no atoms")
+    return zs, masses, amounts / total
+
+
+@functools.lru_cache(maxsize=4096)
+def _features_compositional(formula):
+    """Composition-only features (avg Z, avg mass, element count), cached by formula string."""
+    zs, masses, fractions = _composition_arrays(formula)
+    avg_atomic_number = float(np.dot(fractions, zs))
+    avg_atomic_mass = float(np.dot(fractions, masses))
+    return avg_atomic_number, avg_atomic_mass, len(zs)
+
+
+def extract_features(composition, space_group=216, a=9.9, b=9.9, c=9.9, alpha=90, beta=90, gamma=90):
+    """Extract features from composition and structure for mock prediction."""
+    try:
+        # Structure parameters do not feed the mock features, so the cache is keyed on formula alone
+        return _features_compositional(composition)
+    except Exception as e:
+        return None, None, None
+
+
+# Uniform noise in [-1, 1) for the mock predictions, drawn once and read
+# with a wrapping cursor instead of calling np.random.uniform per value
+_NOISE = np.random.default_rng().uniform(-1.0, 1.0, 1 << 16)
+_NOISE_MASK = len(_NOISE) - 1
+_noise_cursor = itertools.count()
+
+
+def noise(scale):
+    """Next precomputed noise sample, scaled to [-scale, scale)."""
+    return _NOISE[next(_noise_cursor) & _NOISE_MASK] * scale
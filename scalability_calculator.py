@@ -3,10 +3,147 @@ Scalability Score Calculator for AURA Lab
 Calculates manufacturing scalability scores for predicted materials
 """
 
+import functools
 import json
 import re
 from typing import Dict, List, Tuple
-from pymatgen.core import Composition
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    # orjson only speeds up loading the databases; fall back to the stdlib parser
+    orjson = None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_json(path: str) -> Dict:
+    """
+    Parse a JSON database once per process
+    
+    Repeated loads of the same path return the same (shared) object, so
+    creating more calculators does no further I/O. Callers must not
+    modify the result.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+# Element symbols accepted by the pymatgen-free formula tokenizer
+_ELEMENT_SYMBOLS = frozenset("""
+H He Li Be B C N O F Ne Na Mg Al Si P S Cl Ar K Ca Sc Ti V Cr Mn Fe Co
+Ni Cu Zn Ga Ge As Se Br Kr Rb Sr Y Zr Nb Mo Tc Ru Rh Pd Ag Cd In Sn Sb
+Te I Xe Cs Ba La Ce Pr Nd Pm Sm Eu Gd Tb Dy Ho Er Tm Yb Lu Hf Ta W Re Os
+Ir Pt Au Hg Tl Pb Bi Po At Rn Fr Ra Ac Th Pa U Np Pu Am Cm Bk Cf Es Fm
+Md No Lr Rf Db Sg Bh Hs Mt Ds Rg Cn Nh Fl Mc Lv Ts Og
+""".split())
+
+# Plain formulas such as "Li6PS5Cl" or "Li0.5CoO2": element symbols with optional amounts
+_FORMULA_RE = re.compile(r'([A-Z][a-z]?)(\d+(?:\.\d*)?|\.\d+)?')
+_PLAIN_FORMULA_RE = re.compile(r'(?:[A-Z][a-z]?(?:\d+(?:\.\d*)?|\.\d+)?)+')
+
+
+def parse_formula(formula: str):
+    """
+    Split a plain chemical formula into (element symbol, amount) pairs
+    
+    Handles the common case without pymatgen. Returns None for anything
+    the tokenizer does not cover (parentheses, whitespace, unknown
+    symbols, zero amounts) so callers can fall back to pymatgen.
+    
+    Args:
+        formula: Chemical formula (e.g., "Li6PS5Cl")
+    
+    Returns:
+        Tuple of (symbol, amount) pairs in order of first appearance, or None
+    """
+    if not _PLAIN_FORMULA_RE.fullmatch(formula):
+        return None
+    
+    amounts = {}
+    for symbol, amount in _FORMULA_RE.findall(formula):
+        amount = float(amount) if amount else 1.0
+        if symbol not in _ELEMENT_SYMBOLS or amount == 0:
+            return None
+        amounts[symbol] = amounts.get(symbol, 0.0) + amount
+    
+    return tuple(amounts.items())
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_composition(formula: str) -> Tuple[Tuple[str, float], ...]:
+    """
+    Parse a formula into (element symbol, amount) pairs
+    
+    Plain formulas go through the regex tokenizer; anything else is parsed
+    by pymatgen. Cached by formula string. Raises whatever pymatgen raises
+    for invalid formulas.
+    """
+    composition = parse_formula(formula)
+    if composition is not None:
+        return composition
+    
+    # Imported lazily so loading the calculator does not pull in pymatgen
+    from pymatgen.core import Composition
+    
+    return tuple((str(element), count) for element, count in Composition(formula).items())
+
+
+# Elements the material classification rules look at, one bit each
+_CLASS_ELEMENT_BITS = {
+    symbol: 1 << i
+    for i, symbol in enumerate(['S', 'P', 'Cl', 'Br', 'Zr', 'O', 'Ti', 'Ta', 'Si', 'Co', 'Mn', 'Fe'])
+}
+
+
+def _class_for_elements(elements) -> str:
+    """Material class key for a set of element symbols"""
+    # Simple heuristic classification, checked in priority order
+    if 'S' in elements and elements & {'P', 'Cl', 'Br'}:
+        return 'sulfide_electrolytes'
+    elif 'Zr' in elements and 'O' in elements:
+        return 'oxide_electrolytes_garnet'
+    elif elements & {'Ti', 'Ta'} and 'O' in elements:
+        return 'oxide_electrolytes_perovskite'
+    elif elements & {'P', 'Si'} and 'O' in elements:
+        return 'oxide_electrolytes_nasicon'
+    elif 'Co' in elements and 'O' in elements:
+        return 'layered_cathodes'
+    elif 'Mn' in elements and 'O' in elements:
+        return 'spinel_cathodes'
+    elif {'Fe', 'P', 'O'} <= elements:
+        return 'olivine_cathodes'
+    else:
+        return 'default'
+
+
+@functools.lru_cache(maxsize=None)
+def _class_key_table() -> Tuple[Tuple[str, ...], np.ndarray]:
+    """
+    Material class for every combination of the classification elements
+    
+    Built once per process, since it depends only on the rules above.
+    
+    Returns:
+        (class keys, key number per element bitmask); the array is read-only
+    """
+    keys = []
+    table = np.empty(1 << len(_CLASS_ELEMENT_BITS), dtype=np.int16)
+    for mask in range(len(table)):
+        key = _class_for_elements({symbol for symbol, bit in _CLASS_ELEMENT_BITS.items() if mask & bit})
+        if key not in keys:
+            keys.append(key)
+        table[mask] = keys.index(key)
+    table.flags.writeable = False
+    return tuple(keys), table
+
+
+# Batch score rows (score, EAI, SCI, MIS) per formula, shared by every
+# calculator built on the same databases and cleared when it outgrows the limit
+_BATCH_SCORE_CACHE: Dict[Tuple[str, str], Dict[str, Tuple[float, float, float, float]]] = {}
+_BATCH_SCORE_CACHE_SIZE = 8192
 
 
 class ScalabilityCalculator:
@@ -15,11 +152,47 @@ class ScalabilityCalculator:
     def __init__(self, element_data_path='element_data.json', 
                  material_class_data_path='material_class_data.json'):
         """Initialize with element and material class databases"""
-        with open(element_data_path, 'r') as f:
-            self.element_db = json.load(f)
+        self.element_db = _load_json(element_data_path)
+        self.material_class_db = _load_json(material_class_data_path)
+        # Hoisted so hot paths skip the outer dict lookup
+        self._elements = self.element_db['elements']
+        self._classes = self.material_class_db['material_classes']
         
-        with open(material_class_data_path, 'r') as f:
-            self.material_class_db = json.load(f)
+        # Element score = (abundance × 0.6) + (supply chain × 0.4), folded once
+        # here instead of per element per call (the databases are shared, so
+        # the scores live on the instance rather than in element_db)
+        self._combined_scores = {
+            symbol: (elem_data['abundance_score'] * 0.6) + (elem_data['supply_chain_score'] * 0.4)
+            for symbol, elem_data in self._elements.items()
+        }
+        # Array form for the batched path; the extra last slot holds the
+        # default score for elements missing from element_db
+        self._elem_idx = {symbol: i for i, symbol in enumerate(self._combined_scores)}
+        self._combined_score_array = np.array(list(self._combined_scores.values()) + [5.0])
+        
+        # Material class fields as parallel arrays indexed by class number, so
+        # SCI and MIS for a classified material are a few array reads
+        self._class_keys = list(self._classes)
+        self._class_idx = {key: i for i, key in enumerate(self._class_keys)}
+        class_data = list(self._classes.values())
+        self._temp_pen = np.array([c['temperature_penalty'] for c in class_data], dtype=float)
+        self._step_pen = np.array([c['step_penalty'] for c in class_data], dtype=float)
+        self._equip_pen = np.array([c['equipment_penalty'] for c in class_data], dtype=float)
+        self._iface = np.array([c['interface_stability_score'] for c in class_data], dtype=float)
+        self._proc = np.array([c['process_compatibility_score'] for c in class_data], dtype=float)
+        self._scale = np.array([c['scale_demonstration_score'] for c in class_data], dtype=float)
+        
+        # Class number for every combination of the elements the rules look
+        # at, so classifying is a bitmask build and a table lookup
+        keys, key_table = _class_key_table()
+        self._class_table = np.array([self._class_idx[key] for key in keys], dtype=np.int16)[key_table]
+        self._default_class = self._class_idx['default']
+        
+        # Results depend only on the formula, so memoize them per instance
+        self._eai_cached = functools.lru_cache(maxsize=4096)(self._compute_element_abundance_index)
+        self._class_cached = functools.lru_cache(maxsize=4096)(self._classify_index)
+        self._score_cached = functools.lru_cache(maxsize=4096)(self._compute_scalability_score)
+        self._batch_cache = _BATCH_SCORE_CACHE.setdefault((element_data_path, material_class_data_path), {})
     
     def calculate_element_abundance_index(self, formula: str) -> Tuple[float, Dict]:
         """
@@ -30,36 +203,40 @@ class ScalabilityCalculator:
         
         Returns:
             (eai_score, details_dict)
+        
+        Cached per formula; the returned value is shared between calls
+        and must not be modified.
         """
+        return self._eai_cached(formula)
+    
+    def _compute_element_abundance_index(self, formula: str) -> Tuple[float, Dict]:
+        """Uncached body of calculate_element_abundance_index"""
         try:
-            comp = Composition(formula)
+            composition = _parse_composition(formula)
         except:
             # Fallback for invalid formulas
             return 5.0, {"error": "Invalid formula"}
         
+        elements = self._elements
+        combined_scores = self._combined_scores
         element_scores = []
         element_details = []
-        total_atoms = sum(comp.values())
+        total_atoms = sum(count for _, count in composition)
         
-        for element, count in comp.items():
-            element_symbol = str(element)
+        for element_symbol, count in composition:
             atomic_fraction = count / total_atoms
             
-            if element_symbol in self.element_db['elements']:
-                elem_data = self.element_db['elements'][element_symbol]
-                abundance_score = elem_data['abundance_score']
-                supply_chain_score = elem_data['supply_chain_score']
-                
-                # Element score = (abundance × 0.6) + (supply chain × 0.4)
-                element_score = (abundance_score * 0.6) + (supply_chain_score * 0.4)
+            if element_symbol in combined_scores:
+                elem_data = elements[element_symbol]
+                element_score = combined_scores[element_symbol]
                 
                 element_scores.append(element_score * atomic_fraction)
                 element_details.append({
                     'element': element_symbol,
                     'atomic_fraction': round(atomic_fraction, 3),
                     'crustal_abundance_ppm': elem_data['crustal_abundance_ppm'],
-                    'abundance_score': abundance_score,
-                    'supply_chain_score': supply_chain_score,
+                    'abundance_score': elem_data['abundance_score'],
+                    'supply_chain_score': elem_data['supply_chain_score'],
                     'element_score': round(element_score, 2)
                 })
             else:
@@ -88,26 +265,23 @@ class ScalabilityCalculator:
         
         Returns:
             material_class key
+        
+        Cached per formula.
         """
-        formula_lower = formula.lower()
-        
-        # Simple heuristic classification
-        if 's' in formula_lower and ('p' in formula_lower or 'cl' in formula_lower or 'br' in formula_lower):
-            return 'sulfide_electrolytes'
-        elif 'zr' in formula_lower and 'o' in formula_lower:
-            return 'oxide_electrolytes_garnet'
-        elif ('ti' in formula_lower or 'ta' in formula_lower) and 'o' in formula_lower:
-            return 'oxide_electrolytes_perovskite'
-        elif ('p' in formula_lower or 'si' in formula_lower) and 'o' in formula_lower:
-            return 'oxide_electrolytes_nasicon'
-        elif 'co' in formula_lower and 'o' in formula_lower:
-            return 'layered_cathodes'
-        elif 'mn' in formula_lower and 'o' in formula_lower:
-            return 'spinel_cathodes'
-        elif 'fe' in formula_lower and 'p' in formula_lower and 'o' in formula_lower:
-            return 'olivine_cathodes'
-        else:
-            return 'default'
+        return self._class_keys[self._class_cached(formula)]
+    
+    def _classify_index(self, formula: str) -> int:
+        """Class number of a material, indexing the class arrays"""
+        try:
+            composition = _parse_composition(formula)
+        except:
+            # Invalid formulas cannot be classified
+            return self._default_class
+        
+        mask = 0
+        for symbol, _ in composition:
+            mask |= _CLASS_ELEMENT_BITS.get(symbol, 0)
+        return int(self._class_table[mask])
     
     def calculate_synthesis_complexity_index(self, formula: str) -> Tuple[float, Dict]:
         """
@@ -119,9 +293,10 @@ class ScalabilityCalculator:
         Returns:
             (sci_score, details_dict)
         """
-        material_class = self.classify_material(formula)
-        class_data = self.material_class_db['material_classes'][material_class]
-        
+        return self._sci_from_class(self._classes[self.classify_material(formula)])
+    
+    def _sci_from_class(self, class_data: Dict) -> Tuple[float, Dict]:
+        """SCI score and details for an already-classified material"""
         temperature_penalty = class_data['temperature_penalty']
         step_penalty = class_data['step_penalty']
         equipment_penalty = class_data['equipment_penalty']
@@ -150,9 +325,10 @@ class ScalabilityCalculator:
         Returns:
             (mis_score, details_dict)
         """
-        material_class = self.classify_material(formula)
-        class_data = self.material_class_db['material_classes'][material_class]
-        
+        return self._mis_from_class(self._classes[self.classify_material(formula)])
+    
+    def _mis_from_class(self, class_data: Dict) -> Tuple[float, Dict]:
+        """MIS score and details for an already-classified material"""
         interface_stability = class_data['interface_stability_score']
         process_compatibility = class_data['process_compatibility_score']
         scale_demonstration = class_data['scale_demonstration_score']
@@ -165,6 +341,11 @@ class ScalabilityCalculator:
             'scale_demonstration_score': scale_demonstration
         }
     
+    def _compute_sci_mis(self, formula: str) -> Tuple[Tuple[float, Dict], Tuple[float, Dict]]:
+        """SCI and MIS for a material, classifying it only once"""
+        class_data = self._classes[self.classify_material(formula)]
+        return self._sci_from_class(class_data), self._mis_from_class(class_data)
+    
     def calculate_scalability_score(self, formula: str) -> Dict:
         """
         Calculate complete Scalability Score for a material
@@ -174,29 +355,23 @@ class ScalabilityCalculator:
         
         Returns:
             Complete scoring dictionary
+        
+        Cached per formula; the returned value is shared between calls
+        and must not be modified.
         """
+        return self._score_cached(formula)
+    
+    def _compute_scalability_score(self, formula: str) -> Dict:
+        """Uncached body of calculate_scalability_score"""
         # Calculate three core metrics
         eai, eai_details = self.calculate_element_abundance_index(formula)
-        sci, sci_details = self.calculate_synthesis_complexity_index(formula)
-        mis, mis_details = self.calculate_manufacturing_integration_score(formula)
+        (sci, sci_details), (mis, mis_details) = self._compute_sci_mis(formula)
         
         # Weighted average: EAI (40%) + SCI (35%) + MIS (25%)
         scalability_score = (eai * 0.40) + (sci * 0.35) + (mis * 0.25)
         scalability_score = round(scalability_score, 2)
         
-        # Classification
-        if scalability_score >= 8.0:
-            classification = "Highly Scalable"
-            color = "#10b981"  # green
-        elif scalability_score >= 6.0:
-            classification = "Scalable"
-            color = "#3b82f6"  # blue
-        elif scalability_score >= 4.0:
-            classification = "Challenging"
-            color = "#f59e0b"  # orange
-        else:
-            classification = "Not Scalable"
-            color = "#ef4444"  # red
+        classification, color = self.classify_score(scalability_score)
         
         return {
             'formula': formula,
@@ -224,6 +399,109 @@ class ScalabilityCalculator:
                 }
             }
         }
+    
+    def calculate_scalability_batch(self, formulas: List[str], return_metrics: bool = False):
+        """
+        Calculate Scalability Scores for many materials at once
+        
+        Scores match calculate_scalability_score; per-metric details are
+        not built.
+        
+        Args:
+            formulas: Chemical formulas
+            return_metrics: Also return the three core metric scores
+        
+        Returns:
+            Array of scalability scores, in the order of formulas, or
+            (scores, metrics) with metrics of shape (n, 3) holding
+            EAI, SCI and MIS per formula if return_metrics is set
+        
+        Rows are cached per formula across calls, so formulas scored by an
+        earlier batch are not recomputed.
+        """
+        cache = self._batch_cache
+        # Rows for this batch are collected locally, so clearing the shared
+        # cache below cannot drop formulas the batch still needs
+        batch_rows = {formula: cache[formula] for formula in dict.fromkeys(formulas) if formula in cache}
+        new = [formula for formula in dict.fromkeys(formulas) if formula not in batch_rows]
+        if new:
+            new_rows = dict(zip(new, map(tuple, self._score_rows(new).tolist())))
+            batch_rows.update(new_rows)
+            if len(cache) + len(new_rows) > _BATCH_SCORE_CACHE_SIZE:
+                cache.clear()
+            cache.update(new_rows)
+        
+        rows = np.array([batch_rows[formula] for formula in formulas]).reshape(-1, 4)
+        if return_metrics:
+            return rows[:, 0], rows[:, 1:]
+        return rows[:, 0]
+    
+    def _score_rows(self, formulas: List[str]) -> np.ndarray:
+        """Scalability score, EAI, SCI and MIS for each formula, as an (n, 4) array"""
+        eai = self._element_abundance_batch(formulas)
+        
+        # Class number per formula, then SCI and MIS gathered from the class arrays
+        cls = np.fromiter(map(self._class_cached, formulas), dtype=np.intp, count=len(formulas))
+        sci_scores = 10 - (self._temp_pen[cls] + self._step_pen[cls] + self._equip_pen[cls])
+        np.clip(sci_scores, 0, 10, out=sci_scores)
+        np.round(sci_scores, 2, out=sci_scores)
+        mis_scores = np.round((self._iface[cls] + self._proc[cls] + self._scale[cls]) / 3, 2)
+        
+        # Python's round per score keeps results identical to the scalar path
+        raw = (eai * 0.40) + (sci_scores * 0.35) + (mis_scores * 0.25)
+        scores = np.array([round(score, 2) for score in raw.tolist()])
+        
+        return np.column_stack([scores, eai, sci_scores, mis_scores])
+    
+    def _element_abundance_batch(self, formulas: List[str]) -> np.ndarray:
+        """EAI scores for many formulas, accumulated over flat element arrays"""
+        elem_idx = self._elem_idx
+        unknown = len(elem_idx)
+        
+        # One row per (formula, element): owning formula, score slot, atomic fraction
+        owners = []
+        slots = []
+        fractions = []
+        eai = np.full(len(formulas), 5.0)  # Fallback for invalid formulas
+        valid = np.zeros(len(formulas), dtype=bool)
+        for i, formula in enumerate(formulas):
+            try:
+                composition = _parse_composition(formula)
+            except:
+                continue
+            total_atoms = sum(count for _, count in composition)
+            for element_symbol, count in composition:
+                owners.append(i)
+                slots.append(elem_idx.get(element_symbol, unknown))
+                fractions.append(count / total_atoms)
+            valid[i] = True
+        
+        weighted = self._combined_score_array[np.array(slots, dtype=np.intp)] * np.array(fractions)
+        sums = np.bincount(np.array(owners, dtype=np.intp), weights=weighted, minlength=len(formulas))
+        eai[valid] = sums[valid]
+        
+        # Round like calculate_element_abundance_index so both paths agree exactly
+        return np.array([round(score, 2) for score in eai.tolist()])
+    
+    @staticmethod
+    def classify_score(scalability_score: float) -> Tuple[str, str]:
+        """
+        Map a Scalability Score to its classification
+        
+        Args:
+            scalability_score: Score on the 0-10 scale
+        
+        Returns:
+            (classification, display_color)
+        """
+        if scalability_score >= 8.0:
+            return "Highly Scalable", "#10b981"  # green
+        elif scalability_score >= 6.0:
+            return "Scalable", "#3b82f6"  # blue
+        elif scalability_score >= 4.0:
+            return "Challenging", "#f59e0b"  # orange
+        else:
+            return "Not Scalable", "#ef4444"  # red
 
 
 # Convenience function for quick calculations